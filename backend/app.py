@@ -4,23 +4,105 @@ This module provides a RESTful API for generating cover letters using ML/NLP
 """
 
 import os
-import datetime
+import copy
 import json
-from flask import Flask, request, jsonify
+import time
+from collections import OrderedDict
+from itertools import islice
+from flask import Flask, request
 from flask_cors import CORS
 import re  # Add this import for regular expressions
 
+try:
+    import orjson  # C-accelerated JSON encoding for responses
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # multi-pattern substring matching for skill matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    from flask_compress import Compress  # gzip/brotli response compression
+except ImportError:
+    Compress = None
+
+try:
+    import fastjsonschema  # compiles the schema to specialized validator code
+except ImportError:
+    fastjsonschema = None
+
+# Pre-compiled patterns - compiling once at import avoids re-parsing the
+# pattern (and the re-module cache lookup) on every API call.
+# SKILLS and EXPERIENCE sections are captured in one scan of the resume
+# instead of one full pass per section.
+_SECTIONS_RE = re.compile(r'(SKILLS|EXPERIENCE)(?::|.)(.*?)(?=\n\n|\Z)', re.DOTALL | re.IGNORECASE)
+_SKILL_SPLIT_RE = re.compile(r'[,\n]')
+_BULLET_RE = re.compile(r'(?:^|\n)\s*[-•]+\s*(.+?)\s*(?=\n|$)')
+_RESP_SENT_RE = re.compile(r'[^.!?]*(?:responsible|duties)[^.!?]*', re.IGNORECASE)
+
+# Common skill vocabularies, each with a case-insensitive alternation so the
+# input text is scanned once instead of lowercased per skill
+_COMMON_RESUME_SKILLS = ["Python", "Java", "JavaScript", "SQL", "Machine Learning",
+                         "Data Science", "Analytics", "AWS", "Cloud", "Docker"]
+_COMMON_JOB_SKILLS = ["python", "java", "javascript", "sql", "machine learning", "data science",
+                      "analytics", "aws", "cloud", "docker", "communication", "teamwork", "leadership"]
+
+def _skills_pattern(skills):
+    return re.compile(r'\b(' + '|'.join(map(re.escape, skills)) + r')\b', re.IGNORECASE)
+
+_COMMON_RESUME_SKILLS_RE = _skills_pattern(_COMMON_RESUME_SKILLS)
+_COMMON_JOB_SKILLS_RE = _skills_pattern(_COMMON_JOB_SKILLS)
+
+# Canonical display form for each job skill, computed once at import -
+# title-cased with the acronyms hand-fixed so 'sql' renders as 'SQL'
+_SKILL_CANONICAL = {skill: skill.title() for skill in _COMMON_JOB_SKILLS}
+_SKILL_CANONICAL.update({"sql": "SQL", "aws": "AWS"})
+
+# Bounded LRU caches for the two analyzers - users typically regenerate
+# letters with the same resume/job text, so repeat calls become dict lookups
+_RESUME_INFO_CACHE = OrderedDict()
+_JOB_ANALYSIS_CACHE = OrderedDict()
+_CACHE_MAX_SIZE = 256
+
+def _cache_get(cache, key):
+    result = cache.get(key)
+    if result is not None:
+        cache.move_to_end(key)
+        # Deep-copy so callers can't mutate the cached value
+        return copy.deepcopy(result)
+    return None
+
+def _cache_put(cache, key, value):
+    cache[key] = copy.deepcopy(value)
+    if len(cache) > _CACHE_MAX_SIZE:
+        cache.popitem(last=False)
+
+# Patterns used by _clean_letter
+_DOT_WORD_RE = re.compile(r'\.(?=\w)')
+_EMAIL_FIX_RE = re.compile(r'(\w+)\. (\w+@\w+)\. (\w+)')
+_PHONE_FIX_RE = re.compile(r'(\d+)-(\d+)-(\d+)')
+
 # Define a simplified MLCoverLetterGenerator class
 class MLCoverLetterGenerator:
+    # Loaded spaCy model shared by all instances - loading costs seconds and
+    # ~50MB of RAM, so it happens at most once per process
+    _nlp_cache = None
+
     def __init__(self, use_spacy=False):
         self.use_spacy = use_spacy
         self.nlp = None
-        
+
         if use_spacy:
             try:
-                import spacy
-                self.nlp = spacy.load("en_core_web_sm")
-            except:
+                if MLCoverLetterGenerator._nlp_cache is None:
+                    import spacy
+                    MLCoverLetterGenerator._nlp_cache = spacy.load("en_core_web_sm")
+                self.nlp = MLCoverLetterGenerator._nlp_cache
+            except (ImportError, OSError):
+                # Bare except here would swallow KeyboardInterrupt/SystemExit
+                # and hang worker shutdown
                 print("Spacy model not found. Using fallback.")
         
     def extract_resume_info(self, resume_text):
@@ -28,6 +110,10 @@ class MLCoverLetterGenerator:
         Extract information from resume text.
         Simple version that picks out key information.
         """
+        cached = _cache_get(_RESUME_INFO_CACHE, resume_text)
+        if cached is not None:
+            return cached
+
         # Default information
         info = {
             "name": "John Smith",
@@ -42,68 +128,72 @@ class MLCoverLetterGenerator:
         if lines:
             info["name"] = lines[0].strip()
         
+        # Locate the SKILLS and EXPERIENCE sections in a single pass
+        sections = {}
+        for m in _SECTIONS_RE.finditer(resume_text):
+            sections.setdefault(m.group(1).upper(), m.group(2))
+
         # Look for skills
-        skills_section = re.search(r'(?:SKILLS|Skills|skills)(?::|.)(.*?)(?:\n\n|\Z)', resume_text, re.DOTALL)
-        if skills_section:
-            skills_text = skills_section.group(1)
+        skills_text = sections.get("SKILLS")
+        if skills_text is not None:
             # Split by commas or new lines
-            skill_list = re.split(r'[,\n]', skills_text)
+            skill_list = _SKILL_SPLIT_RE.split(skills_text)
             info["skills"] = [s.strip() for s in skill_list if s.strip()]
         else:
-            # If no skills section, look for common skills
-            common_skills = ["Python", "Java", "JavaScript", "SQL", "Machine Learning", 
-                            "Data Science", "Analytics", "AWS", "Cloud", "Docker"]
-            info["skills"] = [skill for skill in common_skills 
-                             if skill.lower() in resume_text.lower()]
+            # If no skills section, look for common skills in a single scan
+            found = {m.group(1).lower() for m in _COMMON_RESUME_SKILLS_RE.finditer(resume_text)}
+            info["skills"] = [skill for skill in _COMMON_RESUME_SKILLS
+                              if skill.lower() in found]
         
         # Extract experience
-        experience_section = re.search(r'(?:EXPERIENCE|Experience|experience)(?::|.)(.*?)(?:\n\n|\Z)', resume_text, re.DOTALL)
-        if experience_section:
-            experience_text = experience_section.group(1)
-            # Simple extraction - get each paragraph as an experience
+        experience_text = sections.get("EXPERIENCE")
+        if experience_text is not None:
+            # Simple extraction - get each paragraph as an experience.
+            # Strip once per paragraph; partition scans once and its head is
+            # the whole string when there is no newline
             experience_paragraphs = experience_text.split('\n\n')
             for para in experience_paragraphs:
-                if para.strip():
+                stripped = para.strip()
+                if stripped:
+                    title, _, _ = stripped.partition('\n')
                     info["experience"].append({
-                        "title": para.strip().split('\n')[0] if '\n' in para else para.strip(),
-                        "description": para.strip()
+                        "title": title,
+                        "description": stripped
                     })
-        
+
+        _cache_put(_RESUME_INFO_CACHE, resume_text, info)
         return info
     
     def analyze_job_description(self, job_description):
         """
         Analyze job description to extract key information.
         """
-        # Extract skills required
-        skills_required = []
-        common_skills = ["python", "java", "javascript", "sql", "machine learning", "data science", 
-                         "analytics", "aws", "cloud", "docker", "communication", "teamwork", "leadership"]
-        
-        for skill in common_skills:
-            if skill.lower() in job_description.lower():
-                skills_required.append(skill.capitalize())
-        
-        # Extract responsibilities
-        responsibilities = []
-        lines = job_description.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith('-') or line.startswith('•'):
-                responsibilities.append(line.lstrip('-•').strip())
-        
+        cached = _cache_get(_JOB_ANALYSIS_CACHE, job_description)
+        if cached is not None:
+            return cached
+
+        # Extract skills required - one scan of the job description instead of
+        # a lowercased copy per skill
+        found = {m.group(1).lower() for m in _COMMON_JOB_SKILLS_RE.finditer(job_description)}
+        skills_required = [_SKILL_CANONICAL[skill] for skill in _COMMON_JOB_SKILLS if skill in found]
+        
+        # Extract responsibilities - bullet lines found in one scan that
+        # stops after the three we keep
+        responsibilities = [m.group(1)
+                            for m in islice(_BULLET_RE.finditer(job_description), 3)]
+
         # If no bullet points, try to extract sentences
         if not responsibilities:
-            sentences = re.split(r'[.!?]', job_description)
-            for sentence in sentences:
-                if 'responsible' in sentence.lower() or 'duties' in sentence.lower():
-                    responsibilities.append(sentence.strip())
+            responsibilities = [m.group(0).strip()
+                                for m in islice(_RESP_SENT_RE.finditer(job_description), 3)]
         
-        return {
+        analysis = {
             "skills_required": skills_required[:5],  # Top 5 skills
             "responsibilities": responsibilities[:3],  # Top 3 responsibilities
             "company_values": ["innovation", "teamwork"]  # Default values
         }
+        _cache_put(_JOB_ANALYSIS_CACHE, job_description, analysis)
+        return analysis
     
     def generate_cover_letter(self, resume_text, job_info):
         """
@@ -128,11 +218,7 @@ class MLCoverLetterGenerator:
         resume_skills = resume_info.get("skills", [])
         required_skills = job_analysis.get("skills_required", [])
         
-        matching_skills = []
-        for skill in resume_skills:
-            if any(req.lower() in skill.lower() or skill.lower() in req.lower() 
-                  for req in required_skills):
-                matching_skills.append(skill)
+        matching_skills = self._match_skills(resume_skills, required_skills)
         
         # If no matching skills, use top resume skills
         if not matching_skills and resume_skills:
@@ -140,61 +226,102 @@ class MLCoverLetterGenerator:
         elif not matching_skills:
             matching_skills = ["relevant skills", "professional experience"]
         
-        # Generate cover letter
-        letter = f"Dear Hiring Manager,\n\n"
-        
+        # The skill list phrase appears in both the intro and the closing -
+        # build it once
+        if len(matching_skills) > 1:
+            skills_phrase = ', '.join(matching_skills[:-1]) + ' and ' + matching_skills[-1]
+        elif matching_skills:
+            skills_phrase = matching_skills[0]
+        else:
+            skills_phrase = ''
+
+        # Generate cover letter - collect the pieces in a list and join once
+        # instead of repeated str += copies
+        parts = [f"Dear Hiring Manager,\n\n"]
+
         # Introduction
-        letter += f"I am writing to express my interest in the {job_title} position at {company_name}. "
-        letter += f"With my background in {', '.join(matching_skills[:-1])}{' and ' if len(matching_skills) > 1 else ''}{matching_skills[-1] if matching_skills else ''}, "
-        letter += f"I am confident I would be a valuable addition to your team.\n\n"
-        
+        parts.append(f"I am writing to express my interest in the {job_title} position at {company_name}. ")
+        parts.append(f"With my background in {skills_phrase}, ")
+        parts.append(f"I am confident I would be a valuable addition to your team.\n\n")
+
         # Body - skills and experience
         if matching_skills:
-            letter += f"My proficiency in {matching_skills[0]} aligns perfectly with the requirements of this position. "
-        
+            parts.append(f"My proficiency in {matching_skills[0]} aligns perfectly with the requirements of this position. ")
+
         # Experience
         experiences = resume_info.get("experience", [])
         if experiences:
             exp = experiences[0]
-            letter += f"Throughout my career, I have developed expertise in {exp.get('title', 'my field')}, "
-            letter += f"which has prepared me to excel in this role. "
+            parts.append(f"Throughout my career, I have developed expertise in {exp.get('title', 'my field')}, ")
+            parts.append(f"which has prepared me to excel in this role. ")
         else:
-            letter += f"Throughout my career, I have developed expertise in {', '.join(resume_skills[:2] if resume_skills else ['relevant areas'])}, "
-            letter += f"which has prepared me to excel in this role. "
-        
+            parts.append(f"Throughout my career, I have developed expertise in {', '.join(resume_skills[:2] if resume_skills else ['relevant areas'])}, ")
+            parts.append(f"which has prepared me to excel in this role. ")
+
         # Value proposition
-        letter += f"My experience with data-driven projects and ability to translate insights into actionable recommendations would allow me to contribute effectively to your team's objectives. "
-        
+        parts.append(f"My experience with data-driven projects and ability to translate insights into actionable recommendations would allow me to contribute effectively to your team's objectives. ")
+
         # Closing
-        letter += f"I am excited about the opportunity to bring my skills in {', '.join(matching_skills[:-1])}{' and ' if len(matching_skills) > 1 else ''}{matching_skills[-1] if matching_skills else ''} to {company_name} and help drive your continued success.\n\n"
-        
+        parts.append(f"I am excited about the opportunity to bring my skills in {skills_phrase} to {company_name} and help drive your continued success.\n\n")
+
         # Signature
-        letter += f"Thank you for your consideration. I look forward to the possibility of discussing how my background and skills would be a good match for this position.\n\n"
-        letter += f"Sincerely,\n{name}\n{email} | {phone}"
-        
+        parts.append(f"Thank you for your consideration. I look forward to the possibility of discussing how my background and skills would be a good match for this position.\n\n")
+        parts.append(f"Sincerely,\n{name}\n{email} | {phone}")
+
         # Clean up the letter
-        letter = self._clean_letter(letter)
+        letter = self._clean_letter(''.join(parts))
         
         return letter
     
+    def _match_skills(self, resume_skills, required_skills):
+        """
+        Return the resume skills that overlap the required skills.
+        A skill matches when either string contains the other. With
+        pyahocorasick installed, the required-in-skill direction becomes a
+        single automaton scan per skill instead of a per-pair substring
+        search.
+        """
+        # Lowercase both sides once instead of inside the nested loop
+        req_low = [req.lower() for req in required_skills]
+        if not req_low:
+            return []
+
+        automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for req in req_low:
+                automaton.add_word(req, req)
+            automaton.make_automaton()
+
+        matching_skills = []
+        for skill in resume_skills:
+            skill_low = skill.lower()
+            if automaton is not None:
+                hit = next(automaton.iter(skill_low), None) is not None
+            else:
+                hit = any(req in skill_low for req in req_low)
+            if hit or any(skill_low in req for req in req_low):
+                matching_skills.append(skill)
+        return matching_skills
+
     def _clean_letter(self, letter):
         """
         Clean up the cover letter.
         """
-        # Fix spacing
-        letter = re.sub(r'\s+', ' ', letter)
-        letter = re.sub(r' \n', '\n', letter)
-        letter = re.sub(r'\n ', '\n', letter)
-        
-        # Fix paragraph breaks
-        letter = letter.replace('\n\n\n', '\n\n')
-        
-        # Restore paragraph breaks
-        letter = re.sub(r'\.(?=\w)', '. ', letter)
-        
+        # Collapse runs of spaces/tabs inside each line while keeping the
+        # paragraph structure - a single str-level pass, no regex engine
+        paragraphs = []
+        for para in letter.split('\n\n'):
+            lines = [' '.join(line.split()) for line in para.split('\n')]
+            paragraphs.append('\n'.join(line for line in lines if line))
+        letter = '\n\n'.join(p for p in paragraphs if p)
+
+        # Fix missing space after a sentence-ending period
+        letter = _DOT_WORD_RE.sub('. ', letter)
+
         # Fix email and phone formatting in signature
-        letter = re.sub(r'(\w+)\. (\w+@\w+)\. (\w+)', r'\1.\2.\3', letter)
-        letter = re.sub(r'(\d+)-(\d+)-(\d+)', r'\1-\2-\3', letter)
+        letter = _EMAIL_FIX_RE.sub(r'\1.\2.\3', letter)
+        letter = _PHONE_FIX_RE.sub(r'\1-\2-\3', letter)
         
         return letter
 
@@ -203,58 +330,171 @@ app = Flask(__name__)
 # Update CORS to accept requests from Vercel deployment
 CORS(app, origins=["http://localhost:3000", "https://my-cl-generator.vercel.app", "https://my-cl-generator-macjacker.vercel.app", "*"])
 
+# Compress responses - the 1-4KB letters are redundant English text that
+# gzips to roughly a third of the size; the threshold leaves small payloads
+# like /api/health untouched
+if Compress is not None:
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    Compress(app)
+
 # Create an instance of the generator
 generator = MLCoverLetterGenerator(use_spacy=False)
 
+# generatedAt string, formatted at most once per wall-clock second so
+# bursty traffic within the same second reuses it
+_ts_second = None
+_ts_string = ''
+
+def _timestamp():
+    global _ts_second, _ts_string
+    now = int(time.time())
+    if now != _ts_second:
+        _ts_second = now
+        _ts_string = time.strftime('%Y-%m-%d %H:%M:%S')
+    return _ts_string
+
+# Schema for the generate endpoints - rejecting malformed payloads up front
+# is microseconds, versus running the full pipeline on empty input only to
+# produce a letter addressed to nobody
+_GENERATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "resumeText": {"type": "string", "minLength": 10},
+        "jobInfo": {"type": "object"},
+    },
+    "required": ["resumeText"],
+}
+
+if fastjsonschema is not None:
+    _generate_validator = fastjsonschema.compile(_GENERATE_SCHEMA)
+
+    def _validate_generate(data):
+        """Raise ValueError if the payload fails _GENERATE_SCHEMA"""
+        try:
+            _generate_validator(data)
+        except fastjsonschema.JsonSchemaException as e:
+            raise ValueError(str(e))
+else:
+    def _validate_generate(data):
+        """Raise ValueError if the payload fails _GENERATE_SCHEMA"""
+        if not isinstance(data, dict):
+            raise ValueError("data must be an object")
+        resume_text = data.get('resumeText')
+        if not isinstance(resume_text, str):
+            raise ValueError("data.resumeText must be a string")
+        if len(resume_text) < 10:
+            raise ValueError("data.resumeText must be at least 10 characters long")
+        if 'jobInfo' in data and not isinstance(data['jobInfo'], dict):
+            raise ValueError("data.jobInfo must be an object")
+
+def _parse_json(req):
+    """Parse the request body with orjson when available, else stdlib json.
+
+    Reads the raw bytes without caching so the parsed dict is not retained
+    on the request object for the lifetime of a keepalive connection.
+    """
+    body = req.get_data(cache=False)
+    if not body:
+        return {}
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def _json_response(payload, status=200):
+    """Build a JSON response with orjson when available, else stdlib json"""
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+# The health response never changes and load balancers poll it constantly,
+# so serialize it once at import
+if orjson is not None:
+    _HEALTH_BODY = orjson.dumps({"status": "healthy", "message": "API is running"})
+else:
+    _HEALTH_BODY = json.dumps({"status": "healthy", "message": "API is running"}).encode()
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy", "message": "API is running"})
+    return app.response_class(_HEALTH_BODY, mimetype='application/json')
 
 @app.route('/api/generate-cover-letter', methods=['POST'])
 def generate_cover_letter_api():
     try:
-        data = request.json
-        resume_text = data.get('resumeText', '')
+        data = _parse_json(request)
+        try:
+            _validate_generate(data)
+        except ValueError as e:
+            return _json_response({"error": str(e)}, 400)
+        resume_text = data['resumeText']
         job_info = data.get('jobInfo', {})
-        
+
         cover_letter = generator.generate_cover_letter(resume_text, job_info)
         
-        return jsonify({
+        return _json_response({
             "coverLetter": cover_letter,
-            "generatedAt": str(datetime.datetime.now())
+            "generatedAt": _timestamp()
+        })
+    except Exception as e:
+        return _json_response({"error": str(e)}, 500)
+
+@app.route('/api/generate-cover-letter-batch', methods=['POST'])
+def generate_cover_letter_batch_api():
+    """Generate letters for one resume against many jobs in a single call"""
+    try:
+        data = _parse_json(request)
+        try:
+            _validate_generate(data)
+        except ValueError as e:
+            return _json_response({"error": str(e)}, 400)
+        resume_text = data['resumeText']
+        items = data.get('items', [])
+
+        # The resume is submitted once at the top level, so the memoized
+        # extract_resume_info parses it once and every job reuses the result
+        cover_letters = [generator.generate_cover_letter(resume_text, job_info)
+                         for job_info in items]
+
+        return _json_response({
+            "coverLetters": cover_letters,
+            "generatedAt": _timestamp()
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 @app.route('/api/extract-resume', methods=['POST'])
 def extract_resume_api():
     try:
-        data = request.json
+        data = _parse_json(request)
         resume_text = data.get('resumeText', '')
         
         resume_info = generator.extract_resume_info(resume_text)
         
-        return jsonify({
+        return _json_response({
             "resumeInfo": resume_info
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 @app.route('/api/analyze-job', methods=['POST'])
 def analyze_job_api():
     try:
-        data = request.json
+        data = _parse_json(request)
         job_description = data.get('jobDescription', '')
         
         job_analysis = generator.analyze_job_description(job_description)
         
-        return jsonify({
+        return _json_response({
             "jobAnalysis": job_analysis
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 if __name__ == '__main__':
+    # Direct invocation uses the dev server; production should go through
+    # gunicorn (see Procfile / run_server.py)
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    debug = os.environ.get('DEBUG', 'False').lower() == 'true'
+    app.run(host='0.0.0.0', port=port, debug=debug)
 
@@ -47,42 +47,77 @@ def main():
         try:
             import flask
             import flask_cors
-            import spacy
-            import transformers
             logger.info("All required modules are installed")
         except ImportError as e:
             logger.error(f"Missing required module: {e}")
             logger.error("Please run: pip install -r requirements.txt")
             return 1
-        
-        # Check for spaCy models
-        try:
-            import spacy
-            spacy.load("en_core_web_sm")
-            logger.info("SpaCy model loaded successfully")
-        except:
-            logger.warning("SpaCy model not found. Attempting to download...")
+
+        # The app runs with use_spacy=False by default, so only probe (and
+        # load) the spaCy model when it is explicitly enabled - loading it
+        # unconditionally costs seconds of startup and ~50MB per worker
+        if os.environ.get('USE_SPACY') == '1':
             try:
-                import subprocess
-                subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-                logger.info("SpaCy model downloaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to download spaCy model: {e}")
-                logger.error("Please run: python -m spacy download en_core_web_sm")
+                import spacy
+                spacy.load("en_core_web_sm")
+                logger.info("SpaCy model loaded successfully")
+            except (ImportError, OSError):
+                logger.warning("SpaCy model not found. Attempting to download...")
+                try:
+                    import subprocess
+                    subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
+                    logger.info("SpaCy model downloaded successfully")
+                except Exception as e:
+                    logger.error(f"Failed to download spaCy model: {e}")
+                    logger.error("Please run: python -m spacy download en_core_web_sm")
         
         # Import app after checking requirements
         from app import app
-        
+
         # Get port from environment or use default
         port = int(os.environ.get('PORT', 5000))
-        
+
         # Check if debug mode is enabled
         debug = os.environ.get('DEBUG', 'False').lower() == 'true'
-        
-        # Start the server
-        logger.info(f"Starting server on port {port} (debug={debug})")
-        app.run(host='0.0.0.0', port=port, debug=debug)
-        
+
+        if debug:
+            # Werkzeug dev server - single-threaded, for local debugging only
+            logger.info(f"Starting development server on port {port}")
+            app.run(host='0.0.0.0', port=port, debug=True)
+            return 0
+
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            logger.warning("gunicorn not installed, falling back to the development server")
+            app.run(host='0.0.0.0', port=port, debug=False)
+            return 0
+
+        class StandaloneApplication(BaseApplication):
+            """Run gunicorn in-process with the given Flask app"""
+            def __init__(self, application, options):
+                self.application = application
+                self.options = options
+                super().__init__()
+
+            def load_config(self):
+                for key, value in self.options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return self.application
+
+        # Worker processes bypass the GIL for the CPU-bound text analysis;
+        # threads handle concurrent I/O on the JSON responses
+        workers = int(os.environ.get('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+        logger.info(f"Starting gunicorn on port {port} with {workers} workers")
+        StandaloneApplication(app, {
+            'bind': f'0.0.0.0:{port}',
+            'workers': workers,
+            'worker_class': 'gthread',
+            'threads': 4,
+        }).run()
+
         return 0
         
     except Exception as e: